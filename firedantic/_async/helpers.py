@@ -6,18 +6,27 @@ async def truncate_collection(
 ) -> int:
     """Removes all documents inside a collection.
 
+    Documents are listed without their fields, as only the references are needed, and
+    each batch of them is removed with a single batched write.
+
     :param col_ref: A collection reference to the collection to be truncated.
-    :param batch_size: Batch size for listing documents.
+    :param batch_size: Batch size for listing and deleting documents.
     :return: Number of removed documents.
     """
     count = 0
 
     while True:
+        batch = col_ref._client.batch()
         deleted = 0
-        async for doc in col_ref.limit(batch_size).stream():  # type: ignore
-            await doc.reference.delete()
+        # An empty field projection lists only the document references
+        query = col_ref.select([]).limit(batch_size)
+        async for doc in query.stream():  # type: ignore
+            batch.delete(doc.reference)
             deleted += 1
 
+        if deleted:
+            await batch.commit()
+
         count += deleted
         if deleted < batch_size:
             return count
@@ -1,6 +1,17 @@
 from abc import ABC
 from logging import getLogger
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, TypeVar, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import pydantic
 from google.cloud.firestore_v1 import (
@@ -71,14 +82,37 @@ class AsyncBareModel(pydantic.BaseModel, ABC):
 
         :raise DocumentIDError: If the document ID is not valid.
         """
-        data = self.model_dump(by_alias=True)
-        if self.__document_id__ in data:
-            del data[self.__document_id__]
-
+        data = self.model_dump(by_alias=True, exclude={self.__document_id__})
         doc_ref = self._get_doc_ref()
         await doc_ref.set(data)
         setattr(self, self.__document_id__, doc_ref.id)
 
+    @classmethod
+    async def save_many(
+        cls, models: Iterable["AsyncBareModel"], batch_size: int = 500
+    ) -> None:
+        """
+        Saves multiple models in the database using batched writes.
+
+        :param models: The models to save.
+        :param batch_size: Maximum number of models to write in a single batch.
+        :raise DocumentIDError: If the document ID of any model is not valid.
+        """
+        models = list(models)
+        for start in range(0, len(models), batch_size):
+            chunk = models[start : start + batch_size]
+            batch = CONFIGURATIONS["db"].batch()
+            doc_refs = []
+            for model in chunk:
+                data = model.model_dump(by_alias=True, exclude={model.__document_id__})
+                doc_ref = model._get_doc_ref()
+                batch.set(doc_ref, data)
+                doc_refs.append(doc_ref)
+
+            await batch.commit()
+            for model, doc_ref in zip(chunk, doc_refs):
+                setattr(model, model.__document_id__, doc_ref.id)
+
     async def delete(self) -> None:
         """
         Deletes this model from the database.
@@ -138,11 +172,30 @@ class AsyncBareModel(pydantic.BaseModel, ABC):
         :param offset: Skip the first n results.
         :return: List of found models.
         """
-        query: Union[AsyncQuery, AsyncCollectionReference] = cls._get_col_ref()
-        if filter_:
-            for key, value in filter_.items():
-                query = cls._add_filter(query, key, value)
+        return [
+            model async for model in cls.find_iter(filter_, order_by, limit, offset)
+        ]
+
+    @classmethod
+    async def find_iter(
+        cls: Type[TAsyncBareModel],
+        filter_: Optional[Dict[str, Union[str, dict]]] = None,
+        order_by: Optional[_OrderBy] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> AsyncIterator[TAsyncBareModel]:
+        """Yields models from the database based on a filter as they are streamed.
+        Takes the same parameters as `find`, but doesn't load all results into memory.
+
+        Example: `async for product in Product.find_iter({"stock": {">=": 1}}): ...`.
 
+        :param filter_: The filter criteria.
+        :param order_by: List of columns and direction to order results by.
+        :param limit: Maximum results to return.
+        :param offset: Skip the first n results.
+        :return: Iterator of found models.
+        """
+        query = cls._build_query(filter_)
         if order_by is not None:
             for order_by_item in order_by:
                 field, direction = order_by_item
@@ -152,7 +205,12 @@ class AsyncBareModel(pydantic.BaseModel, ABC):
         if offset is not None:
             query = query.offset(offset)  # type: ignore
 
-        def _cls(doc_id: str, data: Dict[str, Any]) -> TAsyncBareModel:
+        async for doc in query.stream():  # type: ignore
+            data = doc.to_dict()
+            if data is None:
+                continue
+
+            doc_id = doc.id
             if cls.__document_id__ in data:
                 logger.warning(
                     "%s document ID %s contains conflicting %s in data with value %s",
@@ -164,15 +222,33 @@ class AsyncBareModel(pydantic.BaseModel, ABC):
             data[cls.__document_id__] = doc_id
             model = cls(**data)
             setattr(model, cls.__document_id__, doc_id)
-            return model
+            yield model
 
-        return [
-            _cls(doc_id, doc_dict)
-            async for doc_id, doc_dict in (
-                (doc.id, doc.to_dict()) async for doc in query.stream()  # type: ignore
-            )
-            if doc_dict is not None
-        ]
+    @classmethod
+    async def count(cls, filter_: Optional[Dict[str, Union[str, dict]]] = None) -> int:
+        """Returns the number of models in the database matching a filter.
+
+        The documents are counted by Firestore with an aggregation query, without
+        downloading them.
+
+        Example: `Product.count({"stock": {">=": 1}})`.
+
+        :param filter_: The filter criteria.
+        :return: Number of matching models.
+        """
+        query = cls._build_query(filter_)
+        results: List[List[Any]] = await query.count().get()  # type: ignore
+        return int(results[0][0].value)
+
+    @classmethod
+    def _build_query(
+        cls, filter_: Optional[Dict[str, Union[str, dict]]] = None
+    ) -> Union[AsyncQuery, AsyncCollectionReference]:
+        query: Union[AsyncQuery, AsyncCollectionReference] = cls._get_col_ref()
+        if filter_:
+            for key, value in filter_.items():
+                query = cls._add_filter(query, key, value)
+        return query
 
     @classmethod
     def _add_filter(
@@ -244,11 +320,52 @@ class AsyncBareModel(pydantic.BaseModel, ABC):
         setattr(model, cls.__document_id__, doc_id)
         return model
 
+    @classmethod
+    async def get_by_doc_ids(
+        cls: Type[TAsyncBareModel], doc_ids: Iterable[str]
+    ) -> List[TAsyncBareModel]:
+        """Returns models based on multiple document IDs, fetched in a single request.
+
+        :param doc_ids: The document IDs of the entries.
+        :return: The models, in the same order as the document IDs.
+        :raise ModelNotFoundError: Raised if any of the documents is not found.
+        """
+        doc_ids = list(doc_ids)
+        for doc_id in doc_ids:
+            try:
+                cls._validate_document_id(doc_id)
+            except InvalidDocumentID:
+                # See get_by_doc_id for why an invalid ID is reported as not found
+                raise ModelNotFoundError(
+                    f"No '{cls.__name__}' found with {cls.__document_id__} '{doc_id}'"
+                )
+
+        col_ref = cls._get_col_ref()
+        doc_refs = [col_ref.document(doc_id) for doc_id in doc_ids]
+
+        models: Dict[str, TAsyncBareModel] = {}
+        async for document in CONFIGURATIONS["db"].get_all(doc_refs):
+            data = document.to_dict()
+            if data is None:
+                continue
+            data[cls.__document_id__] = document.id
+            model = cls(**data)
+            setattr(model, cls.__document_id__, document.id)
+            models[document.id] = model
+
+        for doc_id in doc_ids:
+            if doc_id not in models:
+                raise ModelNotFoundError(
+                    f"No '{cls.__name__}' found with {cls.__document_id__} '{doc_id}'"
+                )
+
+        return [models[doc_id] for doc_id in doc_ids]
+
     @classmethod
     async def truncate_collection(cls, batch_size: int = 128) -> int:
         """Removes all documents inside a collection.
 
-        :param batch_size: Batch size for listing documents.
+        :param batch_size: Batch size for listing and deleting documents.
         :return: Number of removed documents.
         """
         return await async_truncate_collection(
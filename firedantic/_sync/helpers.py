@@ -4,18 +4,27 @@ from google.cloud.firestore_v1 import CollectionReference
 def truncate_collection(col_ref: CollectionReference, batch_size: int = 128) -> int:
     """Removes all documents inside a collection.
 
+    Documents are listed without their fields, as only the references are needed, and
+    each batch of them is removed with a single batched write.
+
     :param col_ref: A collection reference to the collection to be truncated.
-    :param batch_size: Batch size for listing documents.
+    :param batch_size: Batch size for listing and deleting documents.
     :return: Number of removed documents.
     """
     count = 0
 
     while True:
+        batch = col_ref._client.batch()
         deleted = 0
-        for doc in col_ref.limit(batch_size).stream():  # type: ignore
-            doc.reference.delete()
+        # An empty field projection lists only the document references
+        query = col_ref.select([]).limit(batch_size)
+        for doc in query.stream():  # type: ignore
+            batch.delete(doc.reference)
             deleted += 1
 
+        if deleted:
+            batch.commit()
+
         count += deleted
         if deleted < batch_size:
             return count
@@ -1,5 +1,5 @@
 from logging import getLogger
-from typing import Iterable, List, Optional, Set, Type
+from typing import Dict, Iterable, List, Optional, Set, Type
 
 from google.api_core.operation import Operation
 from google.cloud.firestore_admin_v1 import (
@@ -99,6 +99,8 @@ def set_up_composite_indexes(
         client = FirestoreAdminClient()
 
     operations = []
+    # Models sharing a collection only need the existing indexes listed once
+    indexes_in_db_by_path: Dict[str, Set[IndexDefinition]] = {}
     for model in models:
         if not model.__composite_indexes__:
             continue
@@ -106,7 +108,9 @@ def set_up_composite_indexes(
             f"projects/{gcloud_project}/databases/{database}/"
             f"collectionGroups/{model.get_collection_name()}"
         )
-        indexes_in_db = get_existing_indexes(client, path=path)
+        if path not in indexes_in_db_by_path:
+            indexes_in_db_by_path[path] = get_existing_indexes(client, path=path)
+        indexes_in_db = indexes_in_db_by_path[path]
         model_indexes = set(model.__composite_indexes__)
         existing_indexes = indexes_in_db.intersection(model_indexes)
         new_indexes = model_indexes.difference(indexes_in_db)
@@ -120,6 +124,7 @@ def set_up_composite_indexes(
             logger.info(log_str, index, model.get_collection_name())
             operation = create_composite_index(client, index, path)
             operations.append(operation)
+            indexes_in_db.add(index)
 
     return operations
 
@@ -139,6 +144,10 @@ def set_up_composite_indexes_and_ttl_policies(
     :param client: The Firestore admin client.
     :return: List of operations that were launched.
     """
+    if not client:
+        # Share one admin client between setting up the indexes and TTL policies
+        client = FirestoreAdminClient()
+
     models = list(models)
     ops = set_up_composite_indexes(gcloud_project, models, database, client)
     ops.extend(set_up_ttl_policies(gcloud_project, models, database, client))
@@ -0,0 +1,14 @@
+import asyncio
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """
+    Run all async tests in the same event loop, as the shared Firestore AsyncClient is
+    bound to the loop it was first used in.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
-from typing import Any, List, Optional, Type
+from itertools import count
+from typing import Any, Dict, Iterable, List, Optional, Type
 
 import google.auth.credentials
 import pytest
@@ -132,48 +133,87 @@ class ExpiringModel(AsyncModel):
     content: str
 
 
-@pytest.fixture(autouse=True)
-def configure_db():
-    client = AsyncClient(
+@pytest.fixture(scope="session")
+def firestore_client():
+    return AsyncClient(
         project="ioxio-local-dev",
         credentials=Mock(spec=google.auth.credentials.Credentials),
     )
 
-    prefix = str(uuid.uuid4()) + "-"
-    configure(client, prefix)
+
+# The run ID keeps prefixes unique across test runs against the same emulator, the
+# counter keeps them unique between the tests of a run
+TEST_RUN_ID = uuid.uuid4().hex[:8]
+PREFIX_COUNTER = count()
+
+
+@pytest.fixture(autouse=True)
+def configure_db(firestore_client):
+    # A unique collection prefix per test keeps the tests isolated from each other
+    prefix = f"{TEST_RUN_ID}-{next(PREFIX_COUNTER)}-"
+    configure(firestore_client, prefix)
+
+
+def build_company(
+    company_id: str = "1234567-8", first_name: str = "John", last_name: str = "Doe"
+) -> Company:
+    # The fixture data is known to be valid, so skip the validation
+    owner = Owner.model_construct(first_name=first_name, last_name=last_name)
+    return Company.model_construct(company_id=company_id, owner=owner)
+
+
+def build_product(
+    product_id: Optional[str] = None, price: float = 1.23, stock: int = 3
+) -> Product:
+    if not product_id:
+        product_id = str(uuid.uuid4())
+    return Product.model_construct(product_id=product_id, price=price, stock=stock)
 
 
 @pytest.fixture
 def create_company():
-    async def _create(
-        company_id: str = "1234567-8", first_name: str = "John", last_name: str = "Doe"
-    ):
-        owner = Owner(first_name=first_name, last_name=last_name)
-        company = Company(company_id=company_id, owner=owner)
+    async def _create(**kwargs):
+        company = build_company(**kwargs)
         await company.save()
         return company
 
     return _create
 
 
+@pytest.fixture
+def create_companies_bulk():
+    async def _create(items: Iterable[Dict[str, str]]) -> List[Company]:
+        companies = [build_company(**item) for item in items]
+        await Company.save_many(companies)
+        return companies
+
+    return _create
+
+
 @pytest.fixture
 def create_product():
-    async def _create(
-        product_id: Optional[str] = None, price: float = 1.23, stock: int = 3
-    ):
-        if not product_id:
-            product_id = str(uuid.uuid4())
-        p = Product(product_id=product_id, price=price, stock=stock)
+    async def _create(**kwargs):
+        p = build_product(**kwargs)
         await p.save()
         return p
 
     return _create
 
 
+@pytest.fixture
+def create_products_bulk():
+    async def _create(items: Iterable[Dict[str, Any]]) -> List[Product]:
+        products = [build_product(**item) for item in items]
+        await Product.save_many(products)
+        return products
+
+    return _create
+
+
 @pytest.fixture
 def create_todolist():
     async def _create(name: str, items: List[str]):
-        p = TodoList(name=name, items=items)
+        p = TodoList.model_construct(name=name, items=items)
         await p.save()
         return p
 
@@ -209,24 +249,14 @@ class MockOperation:
     pass
 
 
-class MockListIndexPages:
-    def __init__(self, pages: List[Any]):
-        self._pages = pages
-        self._i = 0
-
-    def __aiter__(self):
-        return self
-
-    async def __anext__(self):
-        if self._i == len(self._pages):
-            raise StopAsyncIteration
-        self._i += 1
-        return self._pages[self._i - 1]
+async def mock_list_index_pages(pages: List[Any]):
+    for page in pages:
+        yield page
 
 
 class MockListIndexOperation:
     def __init__(self, pages: List[Any]):
-        self.pages = MockListIndexPages(pages)
+        self.pages = mock_list_index_pages(pages)
 
 
 class AsyncMockFirestoreAdminClient:
@@ -242,9 +272,11 @@ class AsyncMockFirestoreAdminClient:
             Field.TtlConfig.State.STATE_UNSPECIFIED
         )
         self.updated_field = None
-        self.list_indexes = AsyncMock(return_value=MockListIndexOperation([]))
         self.create_index = AsyncMock()
 
+    async def list_indexes(self, *args, **kwargs) -> MockListIndexOperation:
+        return MockListIndexOperation([])
+
     def get_field_state(self) -> Field.TtlConfig.State:
         return self.field_state
 
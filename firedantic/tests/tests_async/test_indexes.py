@@ -16,6 +16,8 @@ from firedantic.tests.tests_async.conftest import MockListIndexOperation
 
 import pytest  # noqa isort: skip
 
+pytestmark = pytest.mark.asyncio
+
 
 class BaseModelWithIndexes(AsyncModel):
     __collection__ = "modelWithIndexes"
@@ -25,48 +27,63 @@ class BaseModelWithIndexes(AsyncModel):
     age: int
 
 
-@pytest.mark.asyncio
-async def test_set_up_composite_index(mock_admin_client):
-    class ModelWithIndexes(BaseModelWithIndexes):
-        __composite_indexes__ = (
-            collection_index(("name", Query.ASCENDING), ("age", Query.DESCENDING)),
-        )
+class ModelWithIndex(BaseModelWithIndexes):
+    __composite_indexes__ = (
+        collection_index(("name", Query.ASCENDING), ("age", Query.DESCENDING)),
+    )
 
-    result = await async_set_up_composite_indexes(
-        gcloud_project="proj",
-        models=[ModelWithIndexes],
-        client=mock_admin_client,
+
+class ModelWithCollectionGroupIndex(BaseModelWithIndexes):
+    __composite_indexes__ = (
+        collection_group_index(("name", Query.ASCENDING), ("age", Query.DESCENDING)),
     )
-    assert len(result) == 1
 
-    call_list = mock_admin_client.create_index.call_args_list
-    # index is a protobuf structure sent via Google Cloud Admin
-    path = call_list[0][1]["request"].parent
-    assert (
-        path
-        == f"projects/proj/databases/(default)/collectionGroups/{CONFIGURATIONS['prefix']}modelWithIndexes"
+
+class ModelWithIndexAndTTL(BaseModelWithIndexes):
+    __composite_indexes__ = (
+        collection_index(("name", Query.ASCENDING), ("age", Query.DESCENDING)),
+    )
+
+    __ttl_field__ = "expire"
+    expire: datetime
+
+
+class ModelWithTwoIndexes(BaseModelWithIndexes):
+    __composite_indexes__ = (
+        collection_index(("name", Query.ASCENDING), ("age", Query.DESCENDING)),
+        collection_index(("age", Query.ASCENDING), ("name", Query.DESCENDING)),
+    )
+
+
+class ModelWithManyIndexes(BaseModelWithIndexes):
+    __composite_indexes__ = (
+        collection_index(("name", Query.ASCENDING), ("age", Query.DESCENDING)),
+        collection_index(("age", Query.ASCENDING), ("status", Query.DESCENDING)),
+        collection_index(
+            ("age", Query.ASCENDING),
+            ("status", Query.DESCENDING),
+            ("name", Query.DESCENDING),
+        ),
     )
-    index = call_list[0][1]["request"].index
-    assert index.query_scope.name == "COLLECTION"
-    assert len(index.fields) == 2
-    assert index.fields[0].field_path == "name"
-    assert index.fields[0].order.name == Query.ASCENDING
-    assert index.fields[1].field_path == "age"
-    assert index.fields[1].order.name == Query.DESCENDING
 
 
-@pytest.mark.asyncio
-async def test_set_up_collection_group_index(mock_admin_client):
-    class ModelWithIndexes(BaseModelWithIndexes):
-        __composite_indexes__ = (
-            collection_group_index(
-                ("name", Query.ASCENDING), ("age", Query.DESCENDING)
-            ),
-        )
+class ModelWithoutIndexes(AsyncModel):
+    __collection__ = "modelWithoutIndexes"
+
+    name: str
 
+
+@pytest.mark.parametrize(
+    "model, query_scope",
+    [
+        (ModelWithIndex, "COLLECTION"),
+        (ModelWithCollectionGroupIndex, "COLLECTION_GROUP"),
+    ],
+)
+async def test_set_up_composite_index(mock_admin_client, model, query_scope):
     result = await async_set_up_composite_indexes(
         gcloud_project="proj",
-        models=[ModelWithIndexes],
+        models=[model],
         client=mock_admin_client,
     )
     assert len(result) == 1
@@ -79,23 +96,18 @@ async def test_set_up_collection_group_index(mock_admin_client):
         == f"projects/proj/databases/(default)/collectionGroups/{CONFIGURATIONS['prefix']}modelWithIndexes"
     )
     index = call_list[0][1]["request"].index
-    assert index.query_scope.name == "COLLECTION_GROUP"
+    assert index.query_scope.name == query_scope
     assert len(index.fields) == 2
+    assert index.fields[0].field_path == "name"
+    assert index.fields[0].order.name == Query.ASCENDING
+    assert index.fields[1].field_path == "age"
+    assert index.fields[1].order.name == Query.DESCENDING
 
 
-@pytest.mark.asyncio
 async def test_set_up_composite_indexes_and_policies(mock_admin_client):
-    class ModelWithIndexes(BaseModelWithIndexes):
-        __composite_indexes__ = (
-            collection_index(("name", Query.ASCENDING), ("age", Query.DESCENDING)),
-        )
-
-        __ttl_field__ = "expire"
-        expire: datetime
-
     result = await async_set_up_composite_indexes_and_ttl_policies(
         gcloud_project="proj",
-        models=(model for model in [ModelWithIndexes]),  # Test with a generator
+        models=(model for model in [ModelWithIndexAndTTL]),  # Test with a generator
         client=mock_admin_client,
     )
     assert len(result) == 2
@@ -104,34 +116,16 @@ async def test_set_up_composite_indexes_and_policies(mock_admin_client):
     assert len(call_list) == 1
 
 
-@pytest.mark.asyncio
 async def test_set_up_many_composite_indexes(mock_admin_client):
-    class ModelWithIndexes(BaseModelWithIndexes):
-        __composite_indexes__ = (
-            collection_index(("name", Query.ASCENDING), ("age", Query.DESCENDING)),
-            collection_index(("age", Query.ASCENDING), ("status", Query.DESCENDING)),
-            collection_index(
-                ("age", Query.ASCENDING),
-                ("status", Query.DESCENDING),
-                ("name", Query.DESCENDING),
-            ),
-        )
-
     result = await async_set_up_composite_indexes(
         gcloud_project="fake-project",
-        models=[ModelWithIndexes],
+        models=[ModelWithManyIndexes],
         client=mock_admin_client,
     )
     assert len(result) == 3
 
 
-@pytest.mark.asyncio
 async def test_set_up_indexes_model_without_indexes(mock_admin_client):
-    class ModelWithoutIndexes(AsyncModel):
-        __collection__ = "modelWithoutIndexes"
-
-        name: str
-
     result = await async_set_up_composite_indexes(
         gcloud_project="proj",
         models=[ModelWithoutIndexes],
@@ -143,7 +137,6 @@ async def test_set_up_indexes_model_without_indexes(mock_admin_client):
     assert len(call_list) == 0
 
 
-@pytest.mark.asyncio
 async def test_existing_indexes_are_skipped(mock_admin_client):
     resp = ListIndexesResponse(
         {
@@ -179,21 +172,14 @@ async def test_existing_indexes_are_skipped(mock_admin_client):
         return_value=MockListIndexOperation([resp])
     )
 
-    class ModelWithIndexes(BaseModelWithIndexes):
-        __composite_indexes__ = (
-            collection_index(("name", Query.ASCENDING), ("age", Query.DESCENDING)),
-            collection_index(("age", Query.ASCENDING), ("name", Query.DESCENDING)),
-        )
-
     result = await async_set_up_composite_indexes(
         gcloud_project="fake-project",
-        models=[ModelWithIndexes],
+        models=[ModelWithTwoIndexes],
         client=mock_admin_client,
     )
     assert len(result) == 0
 
 
-@pytest.mark.asyncio
 async def test_same_fields_in_another_collection(mock_admin_client):
     # Test that when another collection has an index with exactly the same fields,
     # it won't affect creating an index in the target collection
@@ -219,14 +205,22 @@ async def test_same_fields_in_another_collection(mock_admin_client):
         return_value=MockListIndexOperation([resp])
     )
 
-    class ModelWithIndexes(BaseModelWithIndexes):
-        __composite_indexes__ = (
-            collection_index(("name", Query.ASCENDING), ("age", Query.DESCENDING)),
-        )
-
     result = await async_set_up_composite_indexes(
         gcloud_project="fake-project",
-        models=[ModelWithIndexes],
+        models=[ModelWithIndex],
         client=mock_admin_client,
     )
     assert len(result) == 1
+
+
+async def test_existing_indexes_are_listed_once_per_collection(mock_admin_client):
+    mock_admin_client.list_indexes = AsyncMock(return_value=MockListIndexOperation([]))
+
+    # Both models use the same collection and share the (name, age) index
+    result = await async_set_up_composite_indexes(
+        gcloud_project="fake-project",
+        models=[ModelWithIndex, ModelWithTwoIndexes],
+        client=mock_admin_client,
+    )
+    assert len(result) == 2
+    assert mock_admin_client.list_indexes.call_count == 1
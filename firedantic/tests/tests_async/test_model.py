@@ -1,5 +1,7 @@
+import asyncio
+from itertools import count
 from operator import attrgetter
-from uuid import uuid4
+from typing import List, Optional
 
 import pytest
 from google.cloud.firestore import Query
@@ -24,12 +26,35 @@ from firedantic.tests.tests_async.conftest import (
     get_user_purchases,
 )
 
-TEST_PRODUCTS = [
+BY_OWNER_FIRST_NAME = attrgetter("owner.first_name")
+BY_OWNER_LAST_NAME = attrgetter("owner.last_name")
+
+
+def get_ids(models) -> List[Optional[str]]:
+    return [model.id for model in models]
+
+
+TEMPLATE_PRODUCT = Product(product_id="product 123", price=123.45, stock=2)
+# Each test runs with its own collection prefix, so a counter is unique enough
+PRODUCT_IDS = (f"product-{n}" for n in count())
+
+TEST_PRODUCTS = (
     {"product_id": "a", "stock": 0},
     {"product_id": "b", "stock": 1},
     {"product_id": "c", "stock": 2},
     {"product_id": "d", "stock": 3},
-]
+)
+
+
+class UserWithoutCollection(AsyncModel):
+    name: str
+
+
+class AliasedUser(AsyncModel):
+    __collection__ = "User"
+
+    first_name: str = Field(..., alias="firstName")
+    city: str
 
 
 @pytest.mark.asyncio
@@ -60,37 +85,35 @@ async def test_find_one(configure_db, create_company):
     with pytest.raises(ModelNotFoundError):
         await Company.find_one()
 
-    company_a: Company = await create_company(company_id="1234555-1", first_name="Foo")
-    company_b: Company = await create_company(company_id="1231231-2", first_name="Bar")
+    company_a, company_b = await asyncio.gather(
+        create_company(company_id="1234555-1", first_name="Foo"),
+        create_company(company_id="1231231-2", first_name="Bar"),
+    )
 
-    a: Company = await Company.find_one({"company_id": company_a.company_id})
-    b: Company = await Company.find_one({"company_id": company_b.company_id})
+    a, b, random_company, first_asc, first_desc = await asyncio.gather(
+        Company.find_one({"company_id": company_a.company_id}),
+        Company.find_one({"company_id": company_b.company_id}),
+        Company.find_one(),
+        Company.find_one(order_by=[("owner.first_name", Query.ASCENDING)]),
+        Company.find_one(order_by=[("owner.first_name", Query.DESCENDING)]),
+    )
 
     assert a.company_id == company_a.company_id
     assert b.company_id == company_b.company_id
     assert a.owner.first_name == "Foo"
     assert b.owner.first_name == "Bar"
-
-    with pytest.raises(ModelNotFoundError):
-        await Company.find_one({"company_id": "Foo"})
-
-    random_company = await Company.find_one()
     assert random_company.company_id in {a.company_id, b.company_id}
-
-    first_asc = await Company.find_one(order_by=[("owner.first_name", Query.ASCENDING)])
     assert first_asc.owner.first_name == "Bar"
-
-    first_desc = await Company.find_one(
-        order_by=[("owner.first_name", Query.DESCENDING)]
-    )
     assert first_desc.owner.first_name == "Foo"
 
+    with pytest.raises(ModelNotFoundError):
+        await Company.find_one({"company_id": "Foo"})
+
 
 @pytest.mark.asyncio
-async def test_find(configure_db, create_company, create_product):
+async def test_find(configure_db, create_companies_bulk, create_products_bulk):
     ids = ["1234555-1", "1234567-8", "2131232-4", "4124432-4"]
-    for company_id in ids:
-        await create_company(company_id=company_id)
+    await create_companies_bulk([{"company_id": company_id} for company_id in ids])
 
     c = await Company.find({"company_id": "4124432-4"})
     assert c[0].company_id == "4124432-4"
@@ -99,29 +122,41 @@ async def test_find(configure_db, create_company, create_product):
     d = await Company.find({"owner.first_name": "John"})
     assert len(d) == 4
 
-    for p in TEST_PRODUCTS:
-        await create_product(**p)
+    await create_products_bulk(TEST_PRODUCTS)
 
-    assert len(await Product.find({})) == 4
+    assert await Product.count() == 4
+    assert await Product.count({"stock": {op.GTE: 1}}) == 3
 
-    products = await Product.find({"stock": {op.GTE: 1}})
-    assert len(products) == 3
-
-    products = await Product.find({"stock": {op.GTE: 2, op.LT: 4}})
-    assert len(products) == 2
-
-    products = await Product.find({"product_id": {op.IN: ["a", "d", "g"]}})
-    assert len(products) == 2
+    in_stock, mid_stock, by_ids = await asyncio.gather(
+        Product.find({"stock": {op.GTE: 1}}),
+        Product.find({"stock": {op.GTE: 2, op.LT: 4}}),
+        Product.find({"product_id": {op.IN: ["a", "d", "g"]}}),
+    )
+    assert len(in_stock) == 3
+    assert len(mid_stock) == 2
+    assert len(by_ids) == 2
 
     with pytest.raises(ValueError):
         await Product.find({"product_id": {"<>": "a"}})
 
 
 @pytest.mark.asyncio
-async def test_find_not_in(configure_db, create_company):
+async def test_find_iter(configure_db, create_products_bulk):
+    await create_products_bulk(TEST_PRODUCTS)
+
+    product_ids = [
+        product.product_id
+        async for product in Product.find_iter(
+            {"stock": {op.GTE: 1}}, order_by=[("stock", Query.ASCENDING)]
+        )
+    ]
+    assert product_ids == ["b", "c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_find_not_in(configure_db, create_companies_bulk):
     ids = ["1234555-1", "1234567-8", "2131232-4", "4124432-4"]
-    for company_id in ids:
-        await create_company(company_id=company_id)
+    await create_companies_bulk([{"company_id": company_id} for company_id in ids])
 
     found = await Company.find(
         {
@@ -140,8 +175,10 @@ async def test_find_not_in(configure_db, create_company):
 
 @pytest.mark.asyncio
 async def test_find_array_contains(configure_db, create_todolist):
-    list_1 = await create_todolist("list_1", ["Work", "Eat", "Sleep"])
-    await create_todolist("list_2", ["Learn Python", "Walk the dog"])
+    list_1, _ = await asyncio.gather(
+        create_todolist("list_1", ["Work", "Eat", "Sleep"]),
+        create_todolist("list_2", ["Learn Python", "Walk the dog"]),
+    )
 
     found = await TodoList.find({"items": {op.ARRAY_CONTAINS: "Eat"}})
     assert len(found) == 1
@@ -150,9 +187,11 @@ async def test_find_array_contains(configure_db, create_todolist):
 
 @pytest.mark.asyncio
 async def test_find_array_contains_any(configure_db, create_todolist):
-    list_1 = await create_todolist("list_1", ["Work", "Eat"])
-    list_2 = await create_todolist("list_2", ["Relax", "Chill", "Sleep"])
-    await create_todolist("list_3", ["Learn Python", "Walk the dog"])
+    list_1, list_2, _ = await asyncio.gather(
+        create_todolist("list_1", ["Work", "Eat"]),
+        create_todolist("list_2", ["Relax", "Chill", "Sleep"]),
+        create_todolist("list_3", ["Learn Python", "Walk the dog"]),
+    )
 
     found = await TodoList.find({"items": {op.ARRAY_CONTAINS_ANY: ["Eat", "Sleep"]}})
     assert len(found) == 2
@@ -161,10 +200,9 @@ async def test_find_array_contains_any(configure_db, create_todolist):
 
 
 @pytest.mark.asyncio
-async def test_find_limit(configure_db, create_company):
+async def test_find_limit(configure_db, create_companies_bulk):
     ids = ["1234555-1", "1234567-8", "2131232-4", "4124432-4"]
-    for company_id in ids:
-        await create_company(company_id=company_id)
+    await create_companies_bulk([{"company_id": company_id} for company_id in ids])
 
     companies_all = await Company.find()
     assert len(companies_all) == 4
@@ -174,7 +212,7 @@ async def test_find_limit(configure_db, create_company):
 
 
 @pytest.mark.asyncio
-async def test_find_order_by(configure_db, create_company):
+async def test_find_order_by(configure_db, create_companies_bulk):
     companies_and_owners = [
         {"company_id": "1234555-1", "last_name": "A", "first_name": "A"},
         {"company_id": "1234555-2", "last_name": "A", "first_name": "B"},
@@ -186,20 +224,17 @@ async def test_find_order_by(configure_db, create_company):
         {"company_id": "4124432-5", "last_name": "D", "first_name": "H"},
     ]
 
-    companies_and_owners = [
-        await create_company(**item) for item in companies_and_owners
-    ]
+    companies_and_owners = await create_companies_bulk(companies_and_owners)
 
     companies_ascending = await Company.find(
         order_by=[("owner.first_name", Query.ASCENDING)]
     )
-    assert companies_ascending == companies_and_owners
+    assert get_ids(companies_ascending) == get_ids(companies_and_owners)
 
     companies_descending = await Company.find(
         order_by=[("owner.first_name", Query.DESCENDING)]
     )
-    reversed_companies_and_owners = list(reversed(companies_and_owners))
-    assert companies_descending == reversed_companies_and_owners
+    assert get_ids(companies_descending) == get_ids(reversed(companies_and_owners))
 
     lastname_ascending_firstname_descending = await Company.find(
         order_by=[
@@ -207,11 +242,10 @@ async def test_find_order_by(configure_db, create_company):
             ("owner.first_name", Query.DESCENDING),
         ]
     )
-    expected = sorted(
-        companies_and_owners, key=attrgetter("owner.first_name"), reverse=True
-    )
-    expected = sorted(expected, key=attrgetter("owner.last_name"))
-    assert expected == lastname_ascending_firstname_descending
+    # Sorting is stable, so sort by the secondary key first
+    expected = sorted(companies_and_owners, key=BY_OWNER_FIRST_NAME, reverse=True)
+    expected.sort(key=BY_OWNER_LAST_NAME)
+    assert get_ids(expected) == get_ids(lastname_ascending_firstname_descending)
 
     lastname_ascending_firstname_ascending = await Company.find(
         order_by=[
@@ -219,19 +253,25 @@ async def test_find_order_by(configure_db, create_company):
             ("owner.first_name", Query.ASCENDING),
         ]
     )
-    assert companies_and_owners == lastname_ascending_firstname_ascending
+    assert get_ids(companies_and_owners) == get_ids(
+        lastname_ascending_firstname_ascending
+    )
 
 
 @pytest.mark.asyncio
-async def test_find_offset(configure_db, create_company):
+async def test_find_offset(configure_db, create_companies_bulk):
     ids_and_lastnames = (
         ("1234555-1", "A"),
         ("1234567-8", "B"),
         ("2131232-4", "C"),
         ("4124432-4", "D"),
     )
-    for company_id, lastname in ids_and_lastnames:
-        await create_company(company_id=company_id, last_name=lastname)
+    await create_companies_bulk(
+        [
+            {"company_id": company_id, "last_name": lastname}
+            for company_id, lastname in ids_and_lastnames
+        ]
+    )
     companies_ascending = await Company.find(
         order_by=[("owner.last_name", Query.ASCENDING)], offset=2
     )
@@ -255,6 +295,25 @@ async def test_get_by_id(configure_db, create_company):
     assert c_2.owner.first_name == "John"
 
 
+@pytest.mark.asyncio
+async def test_get_by_doc_ids(configure_db, create_companies_bulk):
+    companies = await create_companies_bulk(
+        [{"company_id": "1234567-8"}, {"company_id": "1234567-9"}]
+    )
+    ids = [c.id for c in reversed(companies)]
+
+    found = await Company.get_by_doc_ids(ids)
+    assert [c.id for c in found] == ids
+    assert [c.company_id for c in found] == ["1234567-9", "1234567-8"]
+    assert found[0].owner.first_name == "John"
+
+    with pytest.raises(ModelNotFoundError):
+        await Company.get_by_doc_ids([companies[0].id, "missing"])
+
+    with pytest.raises(ModelNotFoundError):
+        await Company.get_by_doc_ids([companies[0].id, "foo/bar"])
+
+
 @pytest.mark.asyncio
 async def test_get_by_empty_str_id(configure_db):
     with pytest.raises(ModelNotFoundError):
@@ -263,30 +322,20 @@ async def test_get_by_empty_str_id(configure_db):
 
 @pytest.mark.asyncio
 async def test_missing_collection(configure_db):
-    class User(AsyncModel):
-        name: str
-
     with pytest.raises(CollectionNotDefined):
-        await User(name="John").save()
+        await UserWithoutCollection(name="John").save()
 
 
 @pytest.mark.asyncio
 async def test_model_aliases(configure_db):
-    class User(AsyncModel):
-        __collection__ = "User"
-
-        first_name: str = Field(..., alias="firstName")
-        city: str
-
-    user = User(firstName="John", city="Helsinki")
+    user = AliasedUser(firstName="John", city="Helsinki")
     await user.save()
 
-    user_from_db = await User.get_by_id(user.id)
+    user_from_db = await AliasedUser.get_by_id(user.id)
     assert user_from_db.first_name == "John"
     assert user_from_db.city == "Helsinki"
 
 
-@pytest.mark.asyncio
 @pytest.mark.parametrize(
     "model_id",
     [
@@ -315,11 +364,30 @@ async def test_model_aliases(configure_db):
         "!:&+-*'()",
     ],
 )
+def test_valid_custom_id_passes_validation(model_id):
+    Product._validate_document_id(model_id)
+
+
+# Store one ID of each kind in the database, the rest are covered by the validation
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "model_id",
+    [
+        "abc",
+        pytest.param("a" * 1500, id="1500 chars"),
+        "...",
+        "b__a__r",
+        "😀",
+        "\x00",
+        "!:&+-*'()",
+    ],
+)
 async def test_models_with_valid_custom_id(configure_db, model_id):
-    product_id = str(uuid4())
+    product_id = next(PRODUCT_IDS)
 
-    product = Product(product_id=product_id, price=123.45, stock=2)
-    product.id = model_id
+    product = TEMPLATE_PRODUCT.model_copy(
+        update={"product_id": product_id, "id": model_id}
+    )
     await product.save()
 
     found = await Product.get_by_id(model_id)
@@ -345,8 +413,7 @@ async def test_models_with_valid_custom_id(configure_db, model_id):
     ],
 )
 async def test_models_with_invalid_custom_id(configure_db, model_id):
-    product = Product(product_id="product 123", price=123.45, stock=2)
-    product.id = model_id
+    product = TEMPLATE_PRODUCT.model_copy(update={"id": model_id})
     with pytest.raises(InvalidDocumentID):
         await product.save()
 
@@ -355,16 +422,28 @@ async def test_models_with_invalid_custom_id(configure_db, model_id):
 
 
 @pytest.mark.asyncio
-async def test_truncate_collection(configure_db, create_company):
-    await create_company(company_id="1234567-8")
-    await create_company(company_id="1234567-9")
+async def test_save_many(configure_db):
+    products = [
+        Product(product_id=product_id, price=1.0, stock=1)
+        for product_id in ("a", "b", "c")
+    ]
+    await Product.save_many(products, batch_size=2)
+
+    assert all(product.id for product in products)
+    found = await Product.get_by_doc_ids(get_ids(products))
+    assert [p.product_id for p in found] == ["a", "b", "c"]
 
-    companies = await Company.find({})
-    assert len(companies) == 2
+
+@pytest.mark.asyncio
+async def test_truncate_collection(configure_db, create_companies_bulk):
+    await create_companies_bulk(
+        [{"company_id": "1234567-8"}, {"company_id": "1234567-9"}]
+    )
+
+    assert await Company.count() == 2
 
     await Company.truncate_collection()
-    new_companies = await Company.find({})
-    assert len(new_companies) == 0
+    assert await Company.count() == 0
 
 
 @pytest.mark.asyncio
@@ -379,10 +458,17 @@ async def test_custom_id_model(configure_db):
     assert m.foo is not None
     assert m.bar == "bar"
 
+    # Saving a model loaded by its document ID must not create a new document
+    c = await CustomIDModel.get_by_doc_id(c.foo)
+    await c.save()
+
+    assert await CustomIDModel.count() == 1
+
 
 @pytest.mark.asyncio
 async def test_custom_id_conflict(configure_db):
-    await CustomIDConflictModel(foo="foo", bar="bar").save()
+    c = CustomIDConflictModel(foo="foo", bar="bar")
+    await c.save()
 
     models = await CustomIDModel.find({})
     assert len(models) == 1
@@ -391,27 +477,11 @@ async def test_custom_id_conflict(configure_db):
     assert m.foo != "foo"
     assert m.bar == "bar"
 
-
-@pytest.mark.asyncio
-async def test_model_id_persistency(configure_db):
-    c = CustomIDConflictModel(foo="foo", bar="bar")
-    await c.save()
-
+    # Saving a model loaded by its document ID must not create a new document
     c = await CustomIDConflictModel.get_by_doc_id(c.id)
     await c.save()
 
-    assert len(await CustomIDConflictModel.find({})) == 1
-
-
-@pytest.mark.asyncio
-async def test_bare_model_document_id_persistency(configure_db):
-    c = CustomIDModel(bar="bar")
-    await c.save()
-
-    c = await CustomIDModel.get_by_doc_id(c.foo)
-    await c.save()
-
-    assert len(await CustomIDModel.find({})) == 1
+    assert await CustomIDConflictModel.count() == 1
 
 
 @pytest.mark.asyncio
@@ -437,7 +507,7 @@ async def test_company_stats(configure_db, create_company):
     await stats.save()
 
     # Ensure the data can be still loaded
-    loaded = await company.stats().get_stats()
+    loaded = await company_stats.get_stats()
     assert loaded.sales == stats.sales
 
     # And that we can still save
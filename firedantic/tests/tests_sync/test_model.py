@@ -1,5 +1,6 @@
+from itertools import count
 from operator import attrgetter
-from uuid import uuid4
+from typing import List, Optional
 
 import pytest
 from google.cloud.firestore import Query
@@ -24,12 +25,35 @@ from firedantic.tests.tests_sync.conftest import (
     get_user_purchases,
 )
 
-TEST_PRODUCTS = [
+BY_OWNER_FIRST_NAME = attrgetter("owner.first_name")
+BY_OWNER_LAST_NAME = attrgetter("owner.last_name")
+
+
+def get_ids(models) -> List[Optional[str]]:
+    return [model.id for model in models]
+
+
+TEMPLATE_PRODUCT = Product(product_id="product 123", price=123.45, stock=2)
+# Each test runs with its own collection prefix, so a counter is unique enough
+PRODUCT_IDS = (f"product-{n}" for n in count())
+
+TEST_PRODUCTS = (
     {"product_id": "a", "stock": 0},
     {"product_id": "b", "stock": 1},
     {"product_id": "c", "stock": 2},
     {"product_id": "d", "stock": 3},
-]
+)
+
+
+class UserWithoutCollection(Model):
+    name: str
+
+
+class AliasedUser(Model):
+    __collection__ = "User"
+
+    first_name: str = Field(..., alias="firstName")
+    city: str
 
 
 def test_save_model(configure_db, create_company):
@@ -57,34 +81,34 @@ def test_find_one(configure_db, create_company):
     with pytest.raises(ModelNotFoundError):
         Company.find_one()
 
-    company_a: Company = create_company(company_id="1234555-1", first_name="Foo")
-    company_b: Company = create_company(company_id="1231231-2", first_name="Bar")
+    company_a, company_b = (
+        create_company(company_id="1234555-1", first_name="Foo"),
+        create_company(company_id="1231231-2", first_name="Bar"),
+    )
 
-    a: Company = Company.find_one({"company_id": company_a.company_id})
-    b: Company = Company.find_one({"company_id": company_b.company_id})
+    a, b, random_company, first_asc, first_desc = (
+        Company.find_one({"company_id": company_a.company_id}),
+        Company.find_one({"company_id": company_b.company_id}),
+        Company.find_one(),
+        Company.find_one(order_by=[("owner.first_name", Query.ASCENDING)]),
+        Company.find_one(order_by=[("owner.first_name", Query.DESCENDING)]),
+    )
 
     assert a.company_id == company_a.company_id
     assert b.company_id == company_b.company_id
     assert a.owner.first_name == "Foo"
     assert b.owner.first_name == "Bar"
-
-    with pytest.raises(ModelNotFoundError):
-        Company.find_one({"company_id": "Foo"})
-
-    random_company = Company.find_one()
     assert random_company.company_id in {a.company_id, b.company_id}
-
-    first_asc = Company.find_one(order_by=[("owner.first_name", Query.ASCENDING)])
     assert first_asc.owner.first_name == "Bar"
-
-    first_desc = Company.find_one(order_by=[("owner.first_name", Query.DESCENDING)])
     assert first_desc.owner.first_name == "Foo"
 
+    with pytest.raises(ModelNotFoundError):
+        Company.find_one({"company_id": "Foo"})
+
 
-def test_find(configure_db, create_company, create_product):
+def test_find(configure_db, create_companies_bulk, create_products_bulk):
     ids = ["1234555-1", "1234567-8", "2131232-4", "4124432-4"]
-    for company_id in ids:
-        create_company(company_id=company_id)
+    create_companies_bulk([{"company_id": company_id} for company_id in ids])
 
     c = Company.find({"company_id": "4124432-4"})
     assert c[0].company_id == "4124432-4"
@@ -93,28 +117,39 @@ def test_find(configure_db, create_company, create_product):
     d = Company.find({"owner.first_name": "John"})
     assert len(d) == 4
 
-    for p in TEST_PRODUCTS:
-        create_product(**p)
+    create_products_bulk(TEST_PRODUCTS)
 
-    assert len(Product.find({})) == 4
+    assert Product.count() == 4
+    assert Product.count({"stock": {op.GTE: 1}}) == 3
 
-    products = Product.find({"stock": {op.GTE: 1}})
-    assert len(products) == 3
-
-    products = Product.find({"stock": {op.GTE: 2, op.LT: 4}})
-    assert len(products) == 2
-
-    products = Product.find({"product_id": {op.IN: ["a", "d", "g"]}})
-    assert len(products) == 2
+    in_stock, mid_stock, by_ids = (
+        Product.find({"stock": {op.GTE: 1}}),
+        Product.find({"stock": {op.GTE: 2, op.LT: 4}}),
+        Product.find({"product_id": {op.IN: ["a", "d", "g"]}}),
+    )
+    assert len(in_stock) == 3
+    assert len(mid_stock) == 2
+    assert len(by_ids) == 2
 
     with pytest.raises(ValueError):
         Product.find({"product_id": {"<>": "a"}})
 
 
-def test_find_not_in(configure_db, create_company):
+def test_find_iter(configure_db, create_products_bulk):
+    create_products_bulk(TEST_PRODUCTS)
+
+    product_ids = [
+        product.product_id
+        for product in Product.find_iter(
+            {"stock": {op.GTE: 1}}, order_by=[("stock", Query.ASCENDING)]
+        )
+    ]
+    assert product_ids == ["b", "c", "d"]
+
+
+def test_find_not_in(configure_db, create_companies_bulk):
     ids = ["1234555-1", "1234567-8", "2131232-4", "4124432-4"]
-    for company_id in ids:
-        create_company(company_id=company_id)
+    create_companies_bulk([{"company_id": company_id} for company_id in ids])
 
     found = Company.find(
         {
@@ -132,8 +167,10 @@ def test_find_not_in(configure_db, create_company):
 
 
 def test_find_array_contains(configure_db, create_todolist):
-    list_1 = create_todolist("list_1", ["Work", "Eat", "Sleep"])
-    create_todolist("list_2", ["Learn Python", "Walk the dog"])
+    list_1, _ = (
+        create_todolist("list_1", ["Work", "Eat", "Sleep"]),
+        create_todolist("list_2", ["Learn Python", "Walk the dog"]),
+    )
 
     found = TodoList.find({"items": {op.ARRAY_CONTAINS: "Eat"}})
     assert len(found) == 1
@@ -141,9 +178,11 @@ def test_find_array_contains(configure_db, create_todolist):
 
 
 def test_find_array_contains_any(configure_db, create_todolist):
-    list_1 = create_todolist("list_1", ["Work", "Eat"])
-    list_2 = create_todolist("list_2", ["Relax", "Chill", "Sleep"])
-    create_todolist("list_3", ["Learn Python", "Walk the dog"])
+    list_1, list_2, _ = (
+        create_todolist("list_1", ["Work", "Eat"]),
+        create_todolist("list_2", ["Relax", "Chill", "Sleep"]),
+        create_todolist("list_3", ["Learn Python", "Walk the dog"]),
+    )
 
     found = TodoList.find({"items": {op.ARRAY_CONTAINS_ANY: ["Eat", "Sleep"]}})
     assert len(found) == 2
@@ -151,10 +190,9 @@ def test_find_array_contains_any(configure_db, create_todolist):
         assert lst.name in (list_1.name, list_2.name)
 
 
-def test_find_limit(configure_db, create_company):
+def test_find_limit(configure_db, create_companies_bulk):
     ids = ["1234555-1", "1234567-8", "2131232-4", "4124432-4"]
-    for company_id in ids:
-        create_company(company_id=company_id)
+    create_companies_bulk([{"company_id": company_id} for company_id in ids])
 
     companies_all = Company.find()
     assert len(companies_all) == 4
@@ -163,7 +201,7 @@ def test_find_limit(configure_db, create_company):
     assert len(companies_2) == 2
 
 
-def test_find_order_by(configure_db, create_company):
+def test_find_order_by(configure_db, create_companies_bulk):
     companies_and_owners = [
         {"company_id": "1234555-1", "last_name": "A", "first_name": "A"},
         {"company_id": "1234555-2", "last_name": "A", "first_name": "B"},
@@ -175,16 +213,15 @@ def test_find_order_by(configure_db, create_company):
         {"company_id": "4124432-5", "last_name": "D", "first_name": "H"},
     ]
 
-    companies_and_owners = [create_company(**item) for item in companies_and_owners]
+    companies_and_owners = create_companies_bulk(companies_and_owners)
 
     companies_ascending = Company.find(order_by=[("owner.first_name", Query.ASCENDING)])
-    assert companies_ascending == companies_and_owners
+    assert get_ids(companies_ascending) == get_ids(companies_and_owners)
 
     companies_descending = Company.find(
         order_by=[("owner.first_name", Query.DESCENDING)]
     )
-    reversed_companies_and_owners = list(reversed(companies_and_owners))
-    assert companies_descending == reversed_companies_and_owners
+    assert get_ids(companies_descending) == get_ids(reversed(companies_and_owners))
 
     lastname_ascending_firstname_descending = Company.find(
         order_by=[
@@ -192,11 +229,10 @@ def test_find_order_by(configure_db, create_company):
             ("owner.first_name", Query.DESCENDING),
         ]
     )
-    expected = sorted(
-        companies_and_owners, key=attrgetter("owner.first_name"), reverse=True
-    )
-    expected = sorted(expected, key=attrgetter("owner.last_name"))
-    assert expected == lastname_ascending_firstname_descending
+    # Sorting is stable, so sort by the secondary key first
+    expected = sorted(companies_and_owners, key=BY_OWNER_FIRST_NAME, reverse=True)
+    expected.sort(key=BY_OWNER_LAST_NAME)
+    assert get_ids(expected) == get_ids(lastname_ascending_firstname_descending)
 
     lastname_ascending_firstname_ascending = Company.find(
         order_by=[
@@ -204,18 +240,24 @@ def test_find_order_by(configure_db, create_company):
             ("owner.first_name", Query.ASCENDING),
         ]
     )
-    assert companies_and_owners == lastname_ascending_firstname_ascending
+    assert get_ids(companies_and_owners) == get_ids(
+        lastname_ascending_firstname_ascending
+    )
 
 
-def test_find_offset(configure_db, create_company):
+def test_find_offset(configure_db, create_companies_bulk):
     ids_and_lastnames = (
         ("1234555-1", "A"),
         ("1234567-8", "B"),
         ("2131232-4", "C"),
         ("4124432-4", "D"),
     )
-    for company_id, lastname in ids_and_lastnames:
-        create_company(company_id=company_id, last_name=lastname)
+    create_companies_bulk(
+        [
+            {"company_id": company_id, "last_name": lastname}
+            for company_id, lastname in ids_and_lastnames
+        ]
+    )
     companies_ascending = Company.find(
         order_by=[("owner.last_name", Query.ASCENDING)], offset=2
     )
@@ -238,30 +280,39 @@ def test_get_by_id(configure_db, create_company):
     assert c_2.owner.first_name == "John"
 
 
+def test_get_by_doc_ids(configure_db, create_companies_bulk):
+    companies = create_companies_bulk(
+        [{"company_id": "1234567-8"}, {"company_id": "1234567-9"}]
+    )
+    ids = [c.id for c in reversed(companies)]
+
+    found = Company.get_by_doc_ids(ids)
+    assert [c.id for c in found] == ids
+    assert [c.company_id for c in found] == ["1234567-9", "1234567-8"]
+    assert found[0].owner.first_name == "John"
+
+    with pytest.raises(ModelNotFoundError):
+        Company.get_by_doc_ids([companies[0].id, "missing"])
+
+    with pytest.raises(ModelNotFoundError):
+        Company.get_by_doc_ids([companies[0].id, "foo/bar"])
+
+
 def test_get_by_empty_str_id(configure_db):
     with pytest.raises(ModelNotFoundError):
         Company.get_by_id("")
 
 
 def test_missing_collection(configure_db):
-    class User(Model):
-        name: str
-
     with pytest.raises(CollectionNotDefined):
-        User(name="John").save()
+        UserWithoutCollection(name="John").save()
 
 
 def test_model_aliases(configure_db):
-    class User(Model):
-        __collection__ = "User"
-
-        first_name: str = Field(..., alias="firstName")
-        city: str
-
-    user = User(firstName="John", city="Helsinki")
+    user = AliasedUser(firstName="John", city="Helsinki")
     user.save()
 
-    user_from_db = User.get_by_id(user.id)
+    user_from_db = AliasedUser.get_by_id(user.id)
     assert user_from_db.first_name == "John"
     assert user_from_db.city == "Helsinki"
 
@@ -294,11 +345,31 @@ def test_model_aliases(configure_db):
         "!:&+-*'()",
     ],
 )
+def test_valid_custom_id_passes_validation(model_id):
+    Product._validate_document_id(model_id)
+
+
+# Store one ID of each kind in the database, the rest are covered by the validation
+
+
+@pytest.mark.parametrize(
+    "model_id",
+    [
+        "abc",
+        pytest.param("a" * 1500, id="1500 chars"),
+        "...",
+        "b__a__r",
+        "😀",
+        "\x00",
+        "!:&+-*'()",
+    ],
+)
 def test_models_with_valid_custom_id(configure_db, model_id):
-    product_id = str(uuid4())
+    product_id = next(PRODUCT_IDS)
 
-    product = Product(product_id=product_id, price=123.45, stock=2)
-    product.id = model_id
+    product = TEMPLATE_PRODUCT.model_copy(
+        update={"product_id": product_id, "id": model_id}
+    )
     product.save()
 
     found = Product.get_by_id(model_id)
@@ -323,8 +394,7 @@ def test_models_with_valid_custom_id(configure_db, model_id):
     ],
 )
 def test_models_with_invalid_custom_id(configure_db, model_id):
-    product = Product(product_id="product 123", price=123.45, stock=2)
-    product.id = model_id
+    product = TEMPLATE_PRODUCT.model_copy(update={"id": model_id})
     with pytest.raises(InvalidDocumentID):
         product.save()
 
@@ -332,16 +402,25 @@ def test_models_with_invalid_custom_id(configure_db, model_id):
         Product.get_by_id(model_id)
 
 
-def test_truncate_collection(configure_db, create_company):
-    create_company(company_id="1234567-8")
-    create_company(company_id="1234567-9")
+def test_save_many(configure_db):
+    products = [
+        Product(product_id=product_id, price=1.0, stock=1)
+        for product_id in ("a", "b", "c")
+    ]
+    Product.save_many(products, batch_size=2)
+
+    assert all(product.id for product in products)
+    found = Product.get_by_doc_ids(get_ids(products))
+    assert [p.product_id for p in found] == ["a", "b", "c"]
+
+
+def test_truncate_collection(configure_db, create_companies_bulk):
+    create_companies_bulk([{"company_id": "1234567-8"}, {"company_id": "1234567-9"}])
 
-    companies = Company.find({})
-    assert len(companies) == 2
+    assert Company.count() == 2
 
     Company.truncate_collection()
-    new_companies = Company.find({})
-    assert len(new_companies) == 0
+    assert Company.count() == 0
 
 
 def test_custom_id_model(configure_db):
@@ -355,9 +434,16 @@ def test_custom_id_model(configure_db):
     assert m.foo is not None
     assert m.bar == "bar"
 
+    # Saving a model loaded by its document ID must not create a new document
+    c = CustomIDModel.get_by_doc_id(c.foo)
+    c.save()
+
+    assert CustomIDModel.count() == 1
+
 
 def test_custom_id_conflict(configure_db):
-    CustomIDConflictModel(foo="foo", bar="bar").save()
+    c = CustomIDConflictModel(foo="foo", bar="bar")
+    c.save()
 
     models = CustomIDModel.find({})
     assert len(models) == 1
@@ -366,25 +452,11 @@ def test_custom_id_conflict(configure_db):
     assert m.foo != "foo"
     assert m.bar == "bar"
 
-
-def test_model_id_persistency(configure_db):
-    c = CustomIDConflictModel(foo="foo", bar="bar")
-    c.save()
-
+    # Saving a model loaded by its document ID must not create a new document
     c = CustomIDConflictModel.get_by_doc_id(c.id)
     c.save()
 
-    assert len(CustomIDConflictModel.find({})) == 1
-
-
-def test_bare_model_document_id_persistency(configure_db):
-    c = CustomIDModel(bar="bar")
-    c.save()
-
-    c = CustomIDModel.get_by_doc_id(c.foo)
-    c.save()
-
-    assert len(CustomIDModel.find({})) == 1
+    assert CustomIDConflictModel.count() == 1
 
 
 def test_bare_model_get_by_empty_doc_id(configure_db):
@@ -407,7 +479,7 @@ def test_company_stats(configure_db, create_company):
     stats.save()
 
     # Ensure the data can be still loaded
-    loaded = company.stats().get_stats()
+    loaded = company_stats.get_stats()
     assert loaded.sales == stats.sales
 
     # And that we can still save
@@ -3,11 +3,13 @@ from typing import Iterator
 
 def get_all_subclasses(cls) -> Iterator:
     """
-    Recursively get all subclasses of a class.
+    Get all subclasses of a class, including indirect ones, depth first.
     """
-    for subclass in cls.__subclasses__():
+    stack = cls.__subclasses__()[::-1]
+    while stack:
+        subclass = stack.pop()
         yield subclass
-        yield from get_all_subclasses(subclass)
+        stack.extend(subclass.__subclasses__()[::-1])
 
 
 def remove_prefix(text: str, prefix: str) -> str:
@@ -2,31 +2,46 @@ import datetime
 import re
 from pathlib import Path
 from textwrap import dedent
-from time import sleep
+from threading import Lock, Timer
+from typing import Optional
 
 from invoke import Exit, task
-from watchdog.observers import Observer
 
 DEV_ENV = {"FIRESTORE_EMULATOR_HOST": "127.0.0.1:8686"}
 SKIP_WATCH = [".idea", ".pytest_cache", "__pycache__", ".git"]
+# Paths inside the skipped directories and editor backup files ending in ~
+IGNORE_WATCH = [
+    r".*[/\\](" + "|".join(re.escape(skip) for skip in SKIP_WATCH) + r")([/\\]|$)",
+    r".*~$",
+]
+# Editors can emit several events for a single save, wait for them to settle
+WATCH_DEBOUNCE_SECONDS = 0.3
 
 
 class TestWatcher:
     def __init__(self, ctx):
         self.ctx = ctx
+        self._lock = Lock()
+        self._run_lock = Lock()
+        self._pending: Optional[Timer] = None
 
-    def dispatch(self, event):
-        # Ignore unwanted events
-        for skip in SKIP_WATCH:
-            if skip in event.src_path:
-                return
+    def on_any_event(self, event):
+        print(f"{event.src_path} {event.event_type}")
 
-        if event.is_directory or event.src_path[-1] == "~":
-            return
+        self.schedule_tests()
 
-        print(f"{event.src_path} {event.event_type}")
+    def schedule_tests(self):
+        # Restart the countdown on every event, so a burst of them runs tests once
+        with self._lock:
+            if self._pending:
+                self._pending.cancel()
+            self._pending = Timer(WATCH_DEBOUNCE_SECONDS, self._run_scheduled_tests)
+            self._pending.daemon = True
+            self._pending.start()
 
-        self.run_tests()
+    def _run_scheduled_tests(self):
+        with self._run_lock:
+            self.run_tests()
 
     def run_tests(self):
         result = run_test_cmd(self.ctx, "pytest", env=DEV_ENV)
@@ -55,20 +70,29 @@ def run_test_cmd(ctx, cmd, env=None) -> int:
 
 @task
 def watch_tests(ctx):
-    handler = TestWatcher(ctx)
+    # Only needed here, so the other tasks don't have to import watchdog
+    from watchdog.events import RegexMatchingEventHandler
+    from watchdog.observers import Observer
+
+    watcher = TestWatcher(ctx)
+    # Let watchdog filter out the unwanted events before they reach the watcher
+    handler = RegexMatchingEventHandler(
+        ignore_regexes=IGNORE_WATCH, ignore_directories=True
+    )
+    handler.on_any_event = watcher.on_any_event
     path = str(Path(".").absolute())
     observer = Observer()
     observer.schedule(handler, path, recursive=True)
     observer.start()
 
     print("Running tests")
-    handler.run_tests()
+    watcher.run_tests()
 
     print(f"Watching {path} for changes.")
 
     try:
-        while True:
-            sleep(1)
+        # Block until interrupted, the observer thread runs until it's stopped
+        observer.join()
     finally:
         observer.stop()
         observer.join()
@@ -2,9 +2,10 @@
 # Original idea is taken from https://github.com/python-trio/unasync
 
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-SUBS = [
+SUBS = (
     ("google.cloud.firestore_v1.async_query", "google.cloud.firestore_v1.base_query"),
     ("AsyncQuery", "BaseQuery"),
     ("AsyncCollectionReference", "CollectionReference"),
@@ -28,39 +29,58 @@ SUBS = [
     ),
     ("async_set_up_composite_indexes", "set_up_composite_indexes"),
     ("await ", ""),
+    # `await asyncio.gather(a, b,)` becomes the tuple `(a, b,)`, keep the trailing comma
+    ("asyncio.gather", ""),
+    ("import asyncio", ""),
     ("__aenter__", "__enter__"),
     ("__aexit__", "__exit__"),
     ("__aiter__", "__iter__"),
     ("@pytest.mark.asyncio", ""),
+    ("pytestmark = pytest.mark.asyncio", ""),
     ("firedantic._async.model", "firedantic._sync.model"),
     ("firedantic._async.ttl_policy", "firedantic._sync.ttl_policy"),
     ("FirestoreAdminAsyncClient", "FirestoreAdminClient"),
     ("google.api_core.operation_async", "google.api_core.operation"),
-]
-COMPILED_SUBS = [
-    (re.compile(r"(^|\b)" + regex + r"($|\b)"), repl) for regex, repl in SUBS
-]
+)
+# The sources are converted as bytes, which skips decoding and encoding them, as all
+# the substitutions are plain ASCII
+COMPILED_SUBS = tuple(
+    (re.compile(rb"(^|\b)" + regex.encode() + rb"($|\b)"), repl.encode())
+    for regex, repl in SUBS
+)
+# All the substitutions as a single pattern, so each file is scanned only once. Each
+# alternative is wrapped in a named group to know which substitution to apply, and
+# MULTILINE keeps ^ and $ matching at the start and end of every line.
+COMBINED_SUBS = re.compile(
+    rb"(?:^|\b)(?:"
+    + b"|".join(f"(?P<sub{i}>{regex})".encode() for i, (regex, _) in enumerate(SUBS))
+    + rb")(?:$|\b)",
+    re.MULTILINE,
+)
+SUBS_BY_GROUP = {f"sub{i}": sub for i, sub in enumerate(COMPILED_SUBS)}
 
 
-def unasync_line(line):
-    for regex, repl in COMPILED_SUBS:
-        line = re.sub(regex, repl, line)
-    return line
+def _replace(match):
+    # Rerun the matching substitution on its own so back references keep working
+    regex, repl = SUBS_BY_GROUP[match.lastgroup]
+    return regex.sub(repl, match.group())
+
+
+def unasync_source(source):
+    return COMBINED_SUBS.sub(_replace, source)
 
 
 def unasync_file(in_path: Path, out_path: Path):
     print(f"{in_path} -> {out_path}")
-    with in_path.open("r") as in_file:
-        with out_path.open("w", newline="") as out_file:
-            for line in in_file.readlines():
-                line = unasync_line(line)
-                out_file.write(line)
+    out_path.write_bytes(unasync_source(in_path.read_bytes()))
 
 
 def unasync_dir(in_dir: Path, out_dir: Path):
-    for in_path in in_dir.glob("**/*.py"):
-        out_path = out_dir / in_path.relative_to(in_dir)
-        unasync_file(in_path, out_path)
+    in_paths = list(in_dir.glob("**/*.py"))
+    out_paths = [out_dir / in_path.relative_to(in_dir) for in_path in in_paths]
+    # The files don't depend on each other, so convert them in parallel
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(unasync_file, in_paths, out_paths))
 
 
 def main():